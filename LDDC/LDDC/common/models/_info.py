@@ -273,6 +273,41 @@ class APIResultList(Sequence[A]):
             cached=self.cached and other.cached,
         )
 
+    @classmethod
+    def concat(cls, results: "Sequence[APIResultList[A]]") -> "APIResultList[A]":
+        """按顺序合并多个APIResultList对象
+
+        范围的合并规则与依次相加(results[0] + results[1] + ...)相同,无法合并时同样抛出ValueError,
+        但所有元素只在最后复制一次
+        """
+        if not results:
+            return cls([])
+        first = results[0]
+        if len(results) == 1:
+            return first
+
+        ranges: dict[Source, tuple[int, int, int]] = dict(first.source_ranges)
+        for result in results[1:]:
+            if not isinstance(result, APIResultList) or not isinstance(first.info, type(result.info)):
+                msg = "只能合并 info 类型相同的 APIResultList"
+                raise TypeError(msg)
+            ranges = cls._merge_source_ranges(ranges, result.source_ranges)
+
+        info = first.info
+        if isinstance(info, SearchInfo):
+            info = SearchInfo(
+                source=list(dict.fromkeys(source for result in results for source in result.sources)),
+                keyword=info.keyword,
+                search_type=info.search_type,
+                page=None,
+            )
+        return cls(
+            result=[item for result in results for item in result._items],  # noqa: SLF001
+            info=info,
+            ranges=ranges,
+            cached=all(result.cached for result in results),
+        )
+
     def _merge_info(self, other: "APIResultList[A]") -> InfoBase | None:
         if isinstance(self.info, SearchInfo):
             return SearchInfo(
@@ -284,12 +319,19 @@ class APIResultList(Sequence[A]):
         return self.info
 
     def _merge_ranges(self, other: "APIResultList[A]") -> dict[Source, tuple[int, int, int]]:
+        return self._merge_source_ranges(self.source_ranges, other.source_ranges)
+
+    @staticmethod
+    def _merge_source_ranges(
+        self_ranges: Mapping[Source, tuple[int, int, int]],
+        other_ranges: Mapping[Source, tuple[int, int, int]],
+    ) -> dict[Source, tuple[int, int, int]]:
         merged_ranges = {}
-        all_sources = {*self.source_ranges.keys(), *other.source_ranges.keys()}
+        all_sources = {*self_ranges.keys(), *other_ranges.keys()}
 
         for source in all_sources:
-            self_range = self.source_ranges.get(source)
-            other_range = other.source_ranges.get(source)
+            self_range = self_ranges.get(source)
+            other_range = other_ranges.get(source)
 
             if not self_range:
                 merged_ranges[source] = other_range
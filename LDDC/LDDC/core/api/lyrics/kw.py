@@ -1,12 +1,17 @@
 # SPDX-FileCopyrightText: Copyright (C) 2024-2025 沉默の金 <cmzj@cmzj.org>
 # SPDX-License-Identifier: GPL-3.0-only
 
-import base64
 import re
 import zlib
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import pybase64 as base64  # 可选的SIMD加速实现,接口与标准库base64一致
+except ImportError:
+    import base64
 
 from LDDC.common.models._enums import LyricsFormat, SearchType, Source
 from LDDC.common.models._info import APIResultList, Artist, SearchInfo, SongInfo
@@ -15,6 +20,18 @@ from LDDC.core.parser.lrc import lrc2mdata
 from LDDC.core.parser.utils import judge_lyrics_type
 
 KEY = b"yeelion"
+_MAX_HEADER_SIZE = 4096  # 歌词响应头部的最大长度,查找头部结束标记时不必扫描之后的压缩数据
+
+_KUWO_TAG_PATTERN = re.compile(r"\[kuwo:(\d+)\]")  # 酷我时间偏移标签
+_LINE_TIME_PATTERN = re.compile(r"^\[(\d{2}:\d{2}\.\d{3})\](.*)$")  # 歌词行匹配
+_WORD_PATTERN = re.compile(r"<(-?\d+),(-?\d+)>([^<]*)")  # 逐字匹配
+_TRANSLATION_PATTERN = re.compile(r"[\u4e00-\u9fa5]")  # 翻译行(含中文)匹配
+_ZERO_TAG_PATTERN = re.compile(r"<0,0>")
+
+# 复用连接(keep-alive),auto_fetch 等并发调用时各线程可共享连接池
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 
 
 def search(keyword: str, search_type: SearchType, page: int = 1) -> Optional[APIResultList[SongInfo]]:
@@ -36,7 +53,7 @@ def search(keyword: str, search_type: SearchType, page: int = 1) -> Optional[API
     }
 
     try:
-        response = requests.get(search_url, params=params, timeout=15)
+        response = _SESSION.get(search_url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
     except (requests.exceptions.RequestException, ValueError):
@@ -102,28 +119,28 @@ def get_lyrics(song_info: SongInfo) -> Optional[Lyrics]:
 # 以下代码是从 kuwo.py 和 kuwo_flask_server.py 迁移和适配而来
 # =====================================================================================
 
-def _format_time(ms: float) -> str:
-    if ms < 0:
-        ms = 0
-    minutes = int(ms / 60000)
-    seconds = int((ms % 60000) / 1000)
-    milliseconds = int(ms % 1000)
+def _format_time(ms: int) -> str:
+    minutes, ms = divmod(max(ms, 0), 60000)
+    seconds, milliseconds = divmod(ms, 1000)
     return f"[{minutes:02d}:{seconds:02d}.{milliseconds:03d}]"
 
 
+def _xor_with_key(data: bytes) -> bytes:
+    """用 KEY 循环异或 data
+
+    将数据与平铺后的密钥都视为一个大整数做一次异或,避免逐字节的Python循环
+    """
+    length = len(data)
+    key_stream = (KEY * (length // len(KEY) + 1))[:length]
+    return (int.from_bytes(data, "little") ^ int.from_bytes(key_stream, "little")).to_bytes(length, "little")
+
+
 def _build_params(music_id: int, is_get_lyricx: bool = True) -> str:
     params_str = f"user=12345,web,web,web&requester=localhost&req=1&rid=MUSIC_{music_id}"
     if is_get_lyricx:
         params_str += "&lrcx=1"
 
-    buf_str = params_str.encode("utf-8")
-    key_len = len(KEY)
-
-    output = bytearray(len(buf_str))
-    for i in range(len(buf_str)):
-        output[i] = buf_str[i] ^ KEY[i % key_len]
-
-    encrypted_buffer = bytes(output)
+    encrypted_buffer = _xor_with_key(params_str.encode("utf-8"))
     final_params = base64.b64encode(encrypted_buffer).decode("utf-8")
     return final_params
 
@@ -132,52 +149,53 @@ def _decode_lyrics(buf: bytes, is_get_lyricx: bool = True) -> str:
     if not buf.startswith(b"tp=content"):
         return ""
 
+    header_end = buf.find(b"\r\n\r\n", 0, _MAX_HEADER_SIZE)
+    if header_end == -1:
+        return ""
+
     try:
-        header_end = buf.index(b"\r\n\r\n") + 4
-        compressed_data = buf[header_end:]
-        inflated_data = zlib.decompress(compressed_data)
+        # zlib 可以直接读取 memoryview,避免切片复制整个压缩数据
+        inflated_data = zlib.decompress(memoryview(buf)[header_end + 4 :])
     except Exception:
         return ""
 
     if not is_get_lyricx:
         return inflated_data.decode("gb18030", errors="ignore")
     else:
-        base64_str = inflated_data.decode("utf-8", errors="ignore")
-        buf_str = base64.b64decode(base64_str)
-        key_len = len(KEY)
-        output = bytearray(len(buf_str))
-
-        for i in range(len(buf_str)):
-            output[i] = buf_str[i] ^ KEY[i % key_len]
-
-        decrypted_buffer = bytes(output)
+        buf_str = base64.b64decode(inflated_data)
+        decrypted_buffer = _xor_with_key(buf_str)
         final_lrc = decrypted_buffer.decode("gb18030", errors="ignore")
         return final_lrc
 
 
+def _is_translation(content: str) -> bool:
+    """翻译行以<0,0>开头且包含中文"""
+    return content.startswith("<0,0>") and _TRANSLATION_PATTERN.search(content) is not None
+
+
 def _convert_kuwo_lrc(raw_lrc: str) -> str:
     lines = raw_lrc.splitlines()
-    kuwo_offset = 1.0
-    kuwo_offset2 = 1.0
+    kuwo_offset = 1
+    kuwo_offset2 = 1
 
-    kuwo_tag_match = re.search(r'\[kuwo:(\d+)\]', raw_lrc)
+    kuwo_tag_match = _KUWO_TAG_PATTERN.search(raw_lrc)
     if kuwo_tag_match:
         kuwo_value = int(kuwo_tag_match.group(1), 8)
         kuwo_offset = kuwo_value // 10
         kuwo_offset2 = kuwo_value % 10
         if kuwo_offset == 0 or kuwo_offset2 == 0:
-            kuwo_offset = 1.0
-            kuwo_offset2 = 1.0
+            kuwo_offset = 1
+            kuwo_offset2 = 1
 
-    line_time_regex = re.compile(r'^\[(\d{2}:\d{2}\.\d{3})\](.*)$')
-    word_regex = re.compile(r'<(-?\d+),(-?\d+)>([^<]*)')
-    translation_regex = re.compile(r'[\u4e00-\u9fa5]')
+    # 每行只匹配与判断一次,处理前一行(查找翻译与结束时间)时直接复用
+    line_matches = [_LINE_TIME_PATTERN.match(line) for line in lines]
+    translation_flags = [match is not None and _is_translation(match.group(2)) for match in line_matches]
 
     processed_lrc = []
     i = 0
     while i < len(lines):
         line = lines[i]
-        line_time_match = line_time_regex.match(line)
+        line_time_match = line_matches[i]
 
         if not line_time_match:
             processed_lrc.append(line)
@@ -185,56 +203,47 @@ def _convert_kuwo_lrc(raw_lrc: str) -> str:
             continue
 
         content = line_time_match.group(2)
-        if re.sub(r'<0,0>', '', content).strip() == '':
+        if _ZERO_TAG_PATTERN.sub('', content).strip() == '':
             i += 1
             continue
         
         line_time_str = line_time_match.group(1)
-        time_parts = re.split(r'[:.]', line_time_str)
-        line_start_time_ms = int(time_parts[0]) * 60000 + int(time_parts[1]) * 1000 + int(time_parts[2])
-
-        is_translation_line = content.startswith('<0,0>') and translation_regex.search(content)
-
-        if not is_translation_line:
-            new_content = ''
-            matches = list(word_regex.finditer(content))
-            for j, match in enumerate(matches):
-                offset, offset2, text = int(match.group(1)), int(match.group(2)), match.group(3)
-                word_start_time_ms = abs((offset + offset2) / (kuwo_offset * 2))
-                absolute_time_ms = line_start_time_ms + word_start_time_ms
-                
-                if j == 0:
-                    new_content += text
-                else:
-                    new_content += f"{_format_time(absolute_time_ms)}{text}"
+        # _LINE_TIME_PATTERN 已保证时间为 mm:ss.fff 格式,直接按固定位置切片
+        line_start_time_ms = int(line_time_str[0:2]) * 60000 + int(line_time_str[3:5]) * 1000 + int(line_time_str[6:9])
+
+        if not translation_flags[i]:
+            content_parts: list[str] = []
+            # 每个字的偏移只解析一次,并全程使用整数运算(时间戳只精确到毫秒,直接向下取整)
+            words = [(int(offset), int(offset2), text) for offset, offset2, text in _WORD_PATTERN.findall(content)]
+            for j, (offset, offset2, text) in enumerate(words):
+                if j != 0:
+                    absolute_time_ms = line_start_time_ms + abs(offset + offset2) // (kuwo_offset * 2)
+                    content_parts.append(_format_time(absolute_time_ms))
+                content_parts.append(text)
+            new_content = "".join(content_parts)
 
             calculated_end_timestamp = ''
-            if matches:
-                last_match = matches[-1]
-                offset, offset2 = int(last_match.group(1)), int(last_match.group(2))
-                word_start_time_ms = abs((offset + offset2) / (kuwo_offset * 2))
-                word_duration_ms = abs((offset - offset2) / (kuwo_offset2 * 2))
-                absolute_end_time_ms = line_start_time_ms + word_start_time_ms + word_duration_ms
-                calculated_end_timestamp = _format_time(absolute_end_time_ms)
+            if words:
+                offset, offset2, _ = words[-1]
+                # 开始时间与持续时间通分后再取整,避免两次取整带来的误差
+                word_end_time_ms = (abs(offset + offset2) * kuwo_offset2 + abs(offset - offset2) * kuwo_offset) // (kuwo_offset * kuwo_offset2 * 2)
+                calculated_end_timestamp = _format_time(line_start_time_ms + word_end_time_ms)
             
             translation_text = ''
             translation_end_timestamp = ''
-            if i + 1 < len(lines):
-                next_line = lines[i+1]
-                next_line_time_match = line_time_regex.match(next_line)
-                if next_line_time_match and next_line_time_match.group(2).startswith('<0,0>') and translation_regex.search(next_line_time_match.group(2)):
-                    translation_text = re.sub(r'<0,0>', '', next_line_time_match.group(2)).strip()
-                    
-                    for j in range(i + 2, len(lines)):
-                        future_line_match = line_time_regex.match(lines[j])
-                        if future_line_match:
-                            translation_end_timestamp = f"[{future_line_match.group(1)}]"
-                            break
-                    
-                    if not translation_end_timestamp:
-                        translation_end_timestamp = calculated_end_timestamp
-                    
-                    i += 1
+            if i + 1 < len(lines) and translation_flags[i + 1]:
+                translation_text = _ZERO_TAG_PATTERN.sub('', line_matches[i + 1].group(2)).strip()
+                
+                for j in range(i + 2, len(lines)):
+                    future_line_match = line_matches[j]
+                    if future_line_match:
+                        translation_end_timestamp = f"[{future_line_match.group(1)}]"
+                        break
+                
+                if not translation_end_timestamp:
+                    translation_end_timestamp = calculated_end_timestamp
+                
+                i += 1
             
             processed_lrc.append(f"[{line_time_str}]{new_content}{calculated_end_timestamp}")
             if translation_text:
@@ -250,7 +259,7 @@ def _fetch_and_convert_kuwo_lrc(music_id: int) -> Optional[str]:
     url = f"http://newlyric.kuwo.cn/newlyric.lrc?{params}"
 
     try:
-        response = requests.get(url, timeout=15)
+        response = _SESSION.get(url, timeout=15)
         response.raise_for_status()
 
         raw_lrc_data = response.content
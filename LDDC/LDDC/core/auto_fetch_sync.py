@@ -7,13 +7,12 @@ using Python's standard concurrent.futures for asynchronous operations.
 """
 
 from collections.abc import Iterable
-from functools import reduce
 from typing import Literal, overload
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future, wait, ALL_COMPLETED
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 
 from LDDC.common.exceptions import AutoFetchUnknownError, LDDCError, LyricsNotFoundError, NotEnoughInfoError
 from LDDC.common.logger import logger
-from LDDC.common.models import APIResultList, Language, LyricInfo, Lyrics, LyricsType, SearchInfo, SearchType, SongInfo, Source
+from LDDC.common.models import APIResultList, Artist, Language, LyricInfo, Lyrics, LyricsType, SearchInfo, SearchType, SongInfo, Source
 from LDDC.core.algorithm import calculate_artist_score, calculate_title_score, text_difference
 from LDDC.core.api.lyrics import get_lyrics, search
 
@@ -59,6 +58,36 @@ def auto_fetch(
     lyrics_results: dict[SongInfo, Lyrics] = {}
     errors: list[Exception] = []
 
+    # 与候选无关的部分只计算一次
+    info_title = info.title or ""
+    info_album = info.album.lower() if info.album else ""
+    info_artist = str(info.artist) if info.artist else ""
+    # 不同源经常返回标题、歌手、专辑完全相同的歌曲,相同的组合只计算一次分数
+    score_cache: dict[tuple[str | None, Artist | None, str | None, bool], float] = {}
+
+    def calculate_score(result: SongInfo, by_keyword: bool) -> float:
+        cache_key = (result.title, result.artist, result.album, by_keyword)
+        if cache_key in score_cache:
+            return score_cache[cache_key]
+
+        if by_keyword:
+            result_title, result_artist, result_album = result.title or "", str(result.artist) if result.artist else "", result.album or ""
+            title_score = calculate_title_score(info_title, result_title)
+            album_score = max(text_difference(info_album, result_album.lower()) * 100, 0) if info_album and result_album else None
+            artist_score = calculate_artist_score(info_artist, result_artist) if info_artist and result_artist else None
+            score = title_score
+            if artist_score is not None:
+                score = max(title_score * 0.5 + artist_score * 0.5, (title_score * 0.5 + artist_score * 0.35 + (album_score or 0) * 0.15) if album_score is not None else 0)
+            elif album_score:
+                score = max(title_score * 0.7 + album_score * 0.3, title_score * 0.8)
+            if title_score < 30:
+                score = max(0, score - 35)
+        else:
+            score = max(text_difference(keywords["file_name"], result.title or "") * 100, text_difference(keywords["file_name"], f"{result.artist!s} - {result.title}")*100)
+
+        score_cache[cache_key] = score
+        return score
+
     with ThreadPoolExecutor() as executor:
         search_tasks: list[Future] = []
         
@@ -68,51 +97,40 @@ def auto_fetch(
             future = executor.submit(search, source, keyword_to_search, SearchType.SONG)
             search_tasks.append(future)
 
-        # Wait for initial search results
-        completed_searches, _ = wait(search_tasks, timeout=timeout, return_when=ALL_COMPLETED)
-
         potential_lyrics_tasks: dict[Future, SongInfo] = {}
 
-        for future in completed_searches:
-            try:
-                results: APIResultList[SongInfo] = future.result()
-                if not results or not isinstance(results.info, SearchInfo):
-                    continue
-
-                result_score: list[tuple[float, SongInfo]] = []
-                for result in results:
-                    if info.duration and abs((info.duration or -4) - (result.duration or -8)) > 4000:
+        # 每个源的搜索完成后立即提交获取歌词的任务,不必等待最慢的搜索源
+        try:
+            for future in as_completed(search_tasks, timeout=timeout):
+                try:
+                    results: APIResultList[SongInfo] = future.result()
+                    if not results or not isinstance(results.info, SearchInfo):
                         continue
-                    
-                    if results.info.keyword in (keywords.get("artist-title"), keywords.get("title")):
-                        title_score = calculate_title_score(info.title or "", result.title or "")
-                        album_score = max(text_difference(info.album.lower(), result.album.lower()) * 100, 0) if info.album and result.album else None
-                        artist_score = calculate_artist_score(str(info.artist), str(result.artist)) if info.artist and result.artist else None
-                        score = title_score
-                        if artist_score is not None:
-                            score = max(title_score * 0.5 + artist_score * 0.5, (title_score * 0.5 + artist_score * 0.35 + (album_score or 0) * 0.15) if album_score is not None else 0)
-                        elif album_score:
-                            score = max(title_score * 0.7 + album_score * 0.3, title_score * 0.8)
-                        if title_score < 30:
-                            score = max(0, score - 35)
-                    else:
-                        score = max(text_difference(keywords["file_name"], result.title or "") * 100, text_difference(keywords["file_name"], f"{result.artist!s} - {result.title}")*100)
-
-                    if score > min_score:
-                        result_score.append((score, result))
-
-                result_score.sort(key=lambda x: x[0], reverse=True)
-
-                # Submit tasks to get lyrics for top candidates
-                for i, (score, song_candidate) in enumerate(result_score):
-                    if i >= 2: break # Try top 2 candidates
-                    songs_score[song_candidate] = score
-                    search_results[song_candidate] = APIResultList([song_candidate, *[r for r in results if r != song_candidate]], results.info)
-                    task = executor.submit(get_lyrics, song_candidate)
-                    potential_lyrics_tasks[task] = song_candidate
 
-            except Exception as e:
-                errors.append(e)
+                    by_keyword = results.info.keyword in (keywords.get("artist-title"), keywords.get("title"))
+                    result_score: list[tuple[float, SongInfo]] = []
+                    for result in results:
+                        if info.duration and abs((info.duration or -4) - (result.duration or -8)) > 4000:
+                            continue
+
+                        score = calculate_score(result, by_keyword)
+                        if score > min_score:
+                            result_score.append((score, result))
+
+                    result_score.sort(key=lambda x: x[0], reverse=True)
+
+                    # Submit tasks to get lyrics for top candidates
+                    for i, (score, song_candidate) in enumerate(result_score):
+                        if i >= 2: break # Try top 2 candidates
+                        songs_score[song_candidate] = score
+                        search_results[song_candidate] = APIResultList([song_candidate, *[r for r in results if r != song_candidate]], results.info)
+                        task = executor.submit(get_lyrics, song_candidate)
+                        potential_lyrics_tasks[task] = song_candidate
+
+                except Exception as e:
+                    errors.append(e)
+        except TimeoutError:
+            pass  # 超时未完成的搜索直接忽略
 
         # Wait for lyrics results
         for future in as_completed(potential_lyrics_tasks):
@@ -129,11 +147,12 @@ def auto_fetch(
              logger.error(f"Errors during auto_fetch: {errors}")
         raise LyricsNotFoundError("没有找到符合要求的歌曲")
 
-    highest_score = max(songs_score.get(song_info, 0) for song_info in lyrics_results)
+    scores = [songs_score.get(song_info, 0) for song_info in lyrics_results]
+    highest_score = max(scores, default=0)
     lyrics_results = {
         song_info: lyrics
-        for song_info, lyrics in lyrics_results.items()
-        if abs(songs_score.get(song_info, 0) - highest_score) <= 15
+        for (song_info, lyrics), score in zip(lyrics_results.items(), scores, strict=True)
+        if abs(score - highest_score) <= 15
     }
 
     def get_rank(lyrics: Lyrics) -> int:
@@ -155,12 +174,12 @@ def auto_fetch(
                 
                 info_key = next(s_info for s_info, l in lyrics_results.items() if l == lyrics)
                 
-                all_search_results = reduce(lambda a, b: a + b, search_results.values()) if search_results else APIResultList([])
+                all_search_results = APIResultList.concat(list(search_results.values()))
                 
                 return lyrics, APIResultList(search_results.get(info_key, APIResultList([])) + all_search_results)
 
     # Fallback if no priority source matched
-    best_lyrics, all_results = sorted_lyrics[0][1], reduce(lambda a, b: a + b, search_results.values(), APIResultList([]))
+    best_lyrics, all_results = sorted_lyrics[0][1], APIResultList.concat(list(search_results.values()))
     if return_search_results:
         return best_lyrics, all_results
     return best_lyrics 
\ No newline at end of file
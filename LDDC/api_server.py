@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import os
 import re
@@ -8,12 +7,15 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import enum
 from contextlib import asynccontextmanager
 from dataclasses import replace
+from pathlib import Path, PurePath
 from typing import Optional
-from functools import reduce
+from functools import lru_cache, reduce
+from itertools import zip_longest
+from operator import or_
 
+import orjson
 from fastapi import FastAPI, Query
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
 
 # 将项目根目录添加到 sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
@@ -59,8 +61,52 @@ SOURCE_MAP = {
     Source.KW: "酷我音乐",
 }
 
+# 搜索时默认使用的词源(同时也是结果交错合并的顺序)
+_ALL_SOURCES = (Source.QM, Source.NE, Source.KG, Source.KW)
+# sources 参数中的词源代码到位标志的映射(第 i 位对应 _ALL_SOURCES[i])
+_SOURCE_CODE_BITS = {
+    "qm": 1 << _ALL_SOURCES.index(Source.QM),
+    "ne": 1 << _ALL_SOURCES.index(Source.NE),
+    "kg": 1 << _ALL_SOURCES.index(Source.KG),
+    "kw": 1 << _ALL_SOURCES.index(Source.KW),
+}
+
+_TOOL_TAG_PATTERN = re.compile(r"\[tool:.*?\]\n\n")  # 歌词开头可选的 tool 标签行
+
+
+def _remove_tool_tag(lrc_text: str) -> str:
+    """移除可选的 tool 标签行，让歌词更纯净"""
+    if "[tool:" not in lrc_text:
+        return lrc_text
+    return _TOOL_TAG_PATTERN.sub("", lrc_text, count=1)
+
+
+def _orjson_default(obj: object) -> object:
+    """处理 orjson 无法直接序列化的类型(dataclass 与枚举由 orjson 直接处理)"""
+    if isinstance(obj, Artist):
+        return list(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError
+
+
+def _stringify(value: object) -> str:
+    """将歌曲信息字段转换为展示用的字符串"""
+    if value is None:
+        return ""
+    if value.__class__ is str:  # 标题、专辑等最常见的情况,无需再调用 str()
+        return value
+    if isinstance(value, Artist):
+        return value.str()
+    if isinstance(value, list):
+        return " / ".join(map(str, value))
+    return str(value)
+
 # 全局线程池
 executor = ThreadPoolExecutor(max_workers=10)
+# 并行搜索各词源使用的线程池
+# search_lyrics_api 本身运行在 executor 中,若再向 executor 提交任务并等待,并发请求较多时会占满线程而互相等待
+search_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="lddc-search")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -69,7 +115,8 @@ async def lifespan(app: FastAPI):
     yield
     # Code after the yield runs on shutdown.
     executor.shutdown(wait=True)
-    logging.info("线程池已成功关闭。")
+    search_executor.shutdown(wait=True)
+    logger.info("线程池已成功关闭。")
 
 # 初始化 FastAPI 应用
 app = FastAPI(
@@ -81,66 +128,91 @@ app = FastAPI(
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# 日志参数使用 %s 占位符延迟格式化，日志级别被过滤时不会格式化消息
+logger = logging.getLogger("lddc.api")
 
 
 def search_lyrics_api(keyword: str, sources_param: Optional[str] = None):
     """
-    API 搜索功能的同步版本，支持选择词源
+    API 搜索功能的同步版本，支持选择词源，返回按词源交错排列的搜索结果迭代器
     
     :param keyword: 搜索关键词
     :param sources_param: 词源选择，格式为逗号分隔的字符串，如"qm,ne,kg"，为空则选择所有词源
     """
-    # 默认所有词源
-    all_sources = [Source.QM, Source.NE, Source.KG, Source.KW]
-    
-    # 解析词源参数
-    selected_sources = all_sources
-    if sources_param:
-        source_map = {
-            "qm": Source.QM,
-            "ne": Source.NE,
-            "kg": Source.KG,
-            "kw": Source.KW,
-        }
-        
-        sources_list = [s.strip().lower() for s in sources_param.split(",")]
-        selected_sources = [source_map.get(s) for s in sources_list if s in source_map]
-        
-        # 如果选择无效，则默认使用所有词源
-        if not selected_sources:
-            selected_sources = all_sources
-    
-    results_by_source = {source: [] for source in all_sources if source in selected_sources}
-    
-    with ThreadPoolExecutor(max_workers=len(results_by_source)) as executor:
-        future_to_source = {
-            executor.submit(search, source, keyword, SearchType.SONG): source
-            for source in results_by_source.keys()
-        }
-        
-        for future in as_completed(future_to_source):
-            source = future_to_source[future]
-            try:
-                result = future.result()
-                if result:
-                    results_by_source[source] = list(result)
-            except Exception as e:
-                source_name = SOURCE_MAP.get(source, str(source))
-                logging.error(f"搜索源 {source_name} 时出错: {e}")
+    # 解析词源参数为位掩码(重复的词源自然合并，无效的词源代码计为 0)
+    mask = reduce(or_, (_SOURCE_CODE_BITS.get(s.strip().lower(), 0) for s in sources_param.split(",")), 0) if sources_param else 0
+
+    # 按 _ALL_SOURCES 的顺序排列选定的词源,搜索结果按相同的位置存放
+    # 如果未选择或选择无效，则默认使用所有词源
+    ordered_sources = [source for i, source in enumerate(_ALL_SOURCES) if mask & (1 << i)] if mask else list(_ALL_SOURCES)
+    results_by_source: list[list[SongInfo]] = [[] for _ in ordered_sources]
+
+    future_to_index = {
+        search_executor.submit(search, source, keyword, SearchType.SONG): i
+        for i, source in enumerate(ordered_sources)
+    }
+
+    for future in as_completed(future_to_index):
+        i = future_to_index[future]
+        try:
+            result = future.result()
+            if result:
+                results_by_source[i] = list(result)
+        except Exception as e:
+            source = ordered_sources[i]
+            source_name = SOURCE_MAP.get(source, str(source))
+            logger.error("搜索源 %s 时出错: %s", source_name, e)
     
     # 将结果交错合并以获得更平衡的列表
-    final_results = []
-    max_len = 0
-    if any(results_by_source.values()):
-        max_len = max(len(v) for v in results_by_source.values())
-    
-    # 保持交错排序逻辑，但只使用选定的词源
-    for i in range(max_len):
-        for source in all_sources:  # 使用所有源的顺序，但跳过未选中的
-            if source in results_by_source and i < len(results_by_source[source]):
-                final_results.append(results_by_source[source][i])
-    
-    return final_results
+    # 返回生成器而不是列表，由调用方在构建响应时直接逐个消费，不再额外生成一份完整的结果列表
+    # (搜索本身已在上面完成，因此消费生成器时不会再进行网络请求，可以安全地在事件循环中迭代)
+    return (
+        song_info
+        for row in zip_longest(*results_by_source)
+        for song_info in row
+        if song_info is not None
+    )
+
+
+def _lyrics_to_lrc(lyrics: Lyrics) -> str:
+    """将歌词转换为逐字LRC文本(存在翻译时一并加入)，并移除 tool 标签行"""
+    langs = ["orig"]
+    if lyrics.get("ts"):
+        langs.append("ts")
+    return _remove_tool_tag(lyrics.to(lyrics_format=LyricsFormat.VERBATIMLRC, langs=langs))
+
+
+@lru_cache(maxsize=1024)
+def _parse_song_info(song_info_json: str) -> SongInfo:
+    """从搜索结果中的 song_info_json 重建用于获取歌词的 SongInfo(按 JSON 字符串缓存)
+
+    各词源的 get_lyrics 会用到 id、标题、歌手、专辑、时长等字段，不能只保留 id 与来源，
+    因此仍完整地重建；客户端请求同一首歌时会原样传回相同的字符串，可直接复用解析结果
+    """
+    # 1. 将 JSON 字符串解析为字典, 并重建 SongInfo 对象
+    original_song_info = SongInfo.from_dict(orjson.loads(song_info_json))
+    # 2. 关键修复：使用 replace() 创建一个新的实例，并强制设置 language=0 以获取翻译
+    return replace(original_song_info, language=0)
+
+
+# 以下两个函数按 SongInfo(不可变、可哈希)缓存转换后的LRC文本，重复请求同一首歌时不必再次搜索、匹配与转换
+# 抛出的异常(如未找到歌词)不会被缓存，下次请求时会重新尝试
+@lru_cache(maxsize=1024)
+def _match_lrc(info: SongInfo) -> Optional[str]:
+    """自动匹配歌词并返回LRC文本，没有原文歌词时返回 None"""
+    lyrics = auto_fetch(info)
+    if not lyrics or not lyrics.get("orig"):
+        return None
+    return _lyrics_to_lrc(lyrics)
+
+
+@lru_cache(maxsize=1024)
+def _get_lrc(info: SongInfo) -> Optional[str]:
+    """获取指定歌曲的歌词并返回LRC文本，没有原文歌词时返回 None"""
+    lyrics = get_lyrics(info)
+    if not lyrics or not lyrics.get("orig"):
+        return None
+    return _lyrics_to_lrc(lyrics)
 
 
 @app.get("/")
@@ -149,30 +221,28 @@ def read_root():
 
 @app.get("/api/search")
 async def search_lyrics_endpoint(keyword: str, sources: Optional[str] = None):
-    loop = asyncio.get_event_loop()
-    results_list = await loop.run_in_executor(executor, search_lyrics_api, keyword, sources)
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(executor, search_lyrics_api, keyword, sources)
     
-    response_data = []
-    for song_info in results_list:
-        serializable_info_dict = jsonable_encoder(song_info)
-        song_info_json_str = json.dumps(serializable_info_dict)
-
-        def stringify(value):
-            if isinstance(value, list):
-                return " / ".join(map(str, value))
-            return str(value) if value is not None else ""
+    # 循环中用到的全局名称绑定为局部变量
+    stringify = _stringify
+    dumps = orjson.dumps
+    source_map = SOURCE_MAP
 
-        response_item = {
+    response_data = [
+        {
             "title": stringify(song_info.title),
             "artist": stringify(song_info.artist),
             "album": stringify(song_info.album),
             "duration": song_info.format_duration,
-            "source": SOURCE_MAP.get(song_info.source, str(song_info.source)),
-            "song_info_json": song_info_json_str,
+            "source": source_map.get(song_info.source, str(song_info.source)),
+            # 直接序列化 dataclass,不再经由 jsonable_encoder 递归复制出中间字典
+            "song_info_json": dumps(song_info, default=_orjson_default).decode(),
         }
-        response_data.append(response_item)
+        for song_info in results
+    ]
 
-    return JSONResponse(content=response_data)
+    return Response(content=orjson.dumps(response_data), media_type="application/json")
 
 
 @app.get("/api/match_lyrics", response_class=PlainTextResponse)
@@ -187,7 +257,6 @@ async def match_lyrics_endpoint(
     根据歌曲信息自动匹配并返回最佳的LRC歌词。
     支持多种参数组合，并能处理歌名/歌手互换的情况。
     """
-    loop = asyncio.get_event_loop()
     song_info_to_try: list[SongInfo] = []
 
     if title and artist:
@@ -198,28 +267,29 @@ async def match_lyrics_endpoint(
             SongInfo(source=Source.QM, title=artist, artist=Artist(title), album=album, duration=duration)
         )
     elif keyword:
-        from pathlib import Path
         song_info_to_try.append(
             SongInfo(source=Source.QM, path=Path(keyword), duration=duration)
         )
     else:
         return PlainTextResponse(content="[00:00.00]必须提供 'title' 和 'artist' 或 'keyword' 参数", status_code=400, media_type="text/plain; charset=utf-8")
 
-    for info in song_info_to_try:
-        try:
-            lyrics: Optional[Lyrics] = await loop.run_in_executor(executor, auto_fetch, info)
-            if lyrics and lyrics.get("orig"):
-                langs = ["orig"]
-                if lyrics.get("ts"):
-                    langs.append("ts")
-                lrc_text = lyrics.to(lyrics_format=LyricsFormat.VERBATIMLRC, langs=langs)
-                final_lrc = re.sub(r"\[tool:.*?\]\n\n", "", lrc_text, count=1)
-                return PlainTextResponse(content=final_lrc, media_type="text/plain; charset=utf-8")
-        except (LyricsNotFoundError, NotEnoughInfoError):
-            continue
-        except Exception as e:
-            logging.error(f"为 '{info.artist_title()}' 匹配时发生未知错误", exc_info=True)
-            continue
+    # 各候选的网络请求互不依赖，同时提交；但仍按候选顺序取结果，靠前的候选匹配成功时优先返回
+    futures = [executor.submit(_match_lrc, info) for info in song_info_to_try]
+    try:
+        for info, future in zip(song_info_to_try, futures):
+            try:
+                final_lrc = await asyncio.wrap_future(future)
+                if final_lrc is not None:
+                    return PlainTextResponse(content=final_lrc, media_type="text/plain; charset=utf-8")
+            except (LyricsNotFoundError, NotEnoughInfoError):
+                continue
+            except Exception as e:
+                logger.error("为 '%s' 匹配时发生未知错误", info.artist_title(), exc_info=True)
+                continue
+    finally:
+        # 已得到结果时取消尚未开始的候选(已在运行的会继续完成，结果会被 _match_lrc 缓存)
+        for future in futures:
+            future.cancel()
             
     return PlainTextResponse(content="[00:00.00]未找到匹配的歌词", status_code=404, media_type="text/plain; charset=utf-8")
 
@@ -230,39 +300,21 @@ async def get_lyrics_by_id_api(song_info_json: str):
     根据歌曲ID和来源获取歌词，并以LRC格式返回。
     """
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
-        # 1. 将 JSON 字符串解析为字典, 并重建 SongInfo 对象
-        song_info_dict = json.loads(song_info_json)
-        original_song_info = SongInfo.from_dict(song_info_dict)
+        # 解析 song_info_json 并设置 language=0 以获取翻译
+        song_info_for_trans = _parse_song_info(song_info_json)
 
-        # 2. 关键修复：使用 replace() 创建一个新的实例，并强制设置 language=0 以获取翻译
-        song_info_for_trans = replace(original_song_info, language=0)
+        # 使用修改后的 song_info 获取歌词并转换为逐字LRC(结果按 song_info 缓存)
+        final_lrc = await loop.run_in_executor(executor, _get_lrc, song_info_for_trans)
 
-        # 3. 使用修改后的 song_info 调用 get_lyrics
-        lyrics: Optional[Lyrics] = await loop.run_in_executor(executor, get_lyrics, song_info_for_trans)
-
-        if not lyrics or not lyrics.get("orig"):
+        if final_lrc is None:
             return PlainTextResponse(content="[00:00.00]没有找到歌词", media_type="text/plain; charset=utf-8")
 
-        # 4. 确定需要的语言，如果存在翻译则加入
-        langs = ["orig"]
-        if lyrics.get("ts"):
-            langs.append("ts")
-
-        # 5. 直接调用Lyrics对象的to方法进行转换，使用逐字格式
-        lrc_text = lyrics.to(
-            lyrics_format=LyricsFormat.VERBATIMLRC,
-            langs=langs
-        )
-        
-        # 6. 移除可选的 tool 标签行，让歌词更纯净
-        final_lrc = re.sub(r"\[tool:.*?\]\n\n", "", lrc_text, count=1)
-
         return PlainTextResponse(content=final_lrc, media_type="text/plain; charset=utf-8")
 
     except Exception as e:
-        logging.error(f"调用 get_lyrics 时发生错误", exc_info=True)
+        logger.error("调用 get_lyrics 时发生错误", exc_info=True)
         return PlainTextResponse(content=f"获取歌词时出错: {e}", status_code=500, media_type="text/plain; charset=utf-8")
 
 
@@ -271,7 +323,7 @@ async def get_kuwo_lrc_endpoint(music_id: int = Query(..., description="酷我
     """
     根据酷我音乐ID获取并转换逐字LRC歌词。
     """
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     try:
         lrc_text = await loop.run_in_executor(executor, fetch_and_convert_kuwo_lrc, music_id)
         if lrc_text:
@@ -279,7 +331,7 @@ async def get_kuwo_lrc_endpoint(music_id: int = Query(..., description="酷我
         else:
             return PlainTextResponse(content="[00:00.00]无法获取或转换歌词", status_code=404, media_type="text/plain; charset=utf-8")
     except Exception as e:
-        logging.error(f"处理酷我歌词时发生错误 (music_id: {music_id})", exc_info=True)
+        logger.error("处理酷我歌词时发生错误 (music_id: %s)", music_id, exc_info=True)
         return PlainTextResponse(content=f"处理歌词时发生内部错误: {e}", status_code=500, media_type="text/plain; charset=utf-8")
 
 
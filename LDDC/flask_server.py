@@ -1,3 +1,10 @@
+# Vercel 部署入口: 导出 api_server 中的 ASGI 应用
+import os
 
-# Updated line 278:
-app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 3000)))
+from api_server import app
+
+if __name__ == "__main__":
+    # 直接运行时使用 uvicorn 提供服务, 异步接口可并发处理请求
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 3000)))